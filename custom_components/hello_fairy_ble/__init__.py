@@ -1,15 +1,12 @@
 from __future__ import annotations
 
-from enum import IntEnum
 from dataclasses import dataclass
 from typing import Callable
 from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_ADDRESS, Platform
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.const import CONF_ADDRESS
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .coordinator import HelloFairyCoordinator
 from .const import DOMAIN
@@ -20,7 +17,7 @@ _LOGGER = logging.getLogger(__name__)
 PLATFORMS: list[Platform] = [Platform.LIGHT, Platform.NUMBER]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RuntimeData:
     """Class to hold Hello Fairy runtime data."""
 
@@ -33,15 +30,37 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
 
     hass.data.setdefault(DOMAIN, {})
 
-    # Look for Hello Fairy device
+    # Look for a connectable Hello Fairy device
     device_address = config_entry.data[CONF_ADDRESS]
-    if not bluetooth.async_ble_device_from_address(hass, device_address, False):
+    ble_device = bluetooth.async_ble_device_from_address(
+        hass, device_address, connectable=True
+    )
+    if ble_device is None:
         raise ConfigEntryNotReady(
             f"Could not find Hello Fairy BLE device with address {device_address}"
         )
 
     # Initialize the coordinator that manages data updates from the API
-    coordinator = HelloFairyCoordinator(hass, config_entry)
+    coordinator = HelloFairyCoordinator(hass, config_entry, ble_device)
+
+    @callback
+    def _async_update_ble(
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        change: bluetooth.BluetoothChange,
+    ) -> None:
+        """Refresh the BLE device handle when the device is seen again."""
+        coordinator.set_ble_device(service_info.device)
+
+    config_entry.async_on_unload(
+        bluetooth.async_register_callback(
+            hass,
+            _async_update_ble,
+            bluetooth.BluetoothCallbackMatcher(
+                address=device_address, connectable=True
+            ),
+            bluetooth.BluetoothScanningMode.PASSIVE,
+        )
+    )
 
     # Perform an initial data load from API
     await coordinator.async_config_entry_first_refresh()
@@ -68,8 +87,10 @@ async def _async_update_listener(hass: HomeAssistant, config_entry: ConfigEntry)
 
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    runtime_data: RuntimeData = hass.data[DOMAIN][config_entry.entry_id]
+
     # Remove the config options update listener
-    hass.data[DOMAIN][config_entry.entry_id].cancel_update_listener()
+    runtime_data.cancel_update_listener()
 
     # Unload platforms
     unload_ok = await hass.config_entries.async_unload_platforms(
@@ -78,6 +99,7 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
 
     # Remove the config entry from the hass data object
     if unload_ok:
+        await runtime_data.coordinator.async_shutdown()
         hass.data[DOMAIN].pop(config_entry.entry_id)
 
     return unload_ok
@@ -10,9 +10,9 @@ for communicating with Hello Fairy smart lights, including:
 """
 
 import asyncio
-import colorsys
 import logging
 import contextlib
+import struct
 from collections.abc import Callable
 
 import bleak_retry_connector
@@ -24,15 +24,67 @@ from .const import (
     COMMAND_CHARACTERISTIC_UUID,
     NOTIFY_CHARACTERISTIC_UUID,
     CMD_PREFIX,
-    CMD_POWER,
     CMD_COLOR_PRESET,
     MODE_COLOR,
     MODE_PRESET,
     EFFECT_PRESETS,
+    EFFECT_NAMES,
+    POWER_ON_FRAME,
+    POWER_OFF_FRAME,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Frame layouts, excluding the trailing checksum byte
+_COLOR_FRAME = struct.Struct(">BBBBHHH")  # prefix, cmd, len, mode, H, S, V
+_PRESET_FRAME = struct.Struct(">BBBBBH")  # prefix, cmd, len, mode, preset, V
+
+# Status notification payloads, starting at byte 8
+_HSV_STATUS = struct.Struct(">HHH")  # H, S, V
+_PRESET_STATUS = struct.Struct(">BH")  # preset, V
+_STATUS_PAYLOADS = {MODE_COLOR: _HSV_STATUS, MODE_PRESET: _PRESET_STATUS}
+
+
+def _cksum(data: bytes) -> int:
+    """Calculate simple sum checksum for Hello Fairy protocol."""
+    return sum(data) & 0xFF
+
+
+# (r, g, b) positions within (C + m, X + m, m) for each 60 degree hue sector
+_HSV_SECTORS = ((0, 1, 2), (1, 0, 2), (2, 0, 1), (2, 1, 0), (1, 2, 0), (0, 2, 1))
+
+
+def _hsv360_to_rgb255(h: int, s: int, v: int) -> tuple[int, int, int]:
+    """Convert H(0-359), S(0-100), V(0-100) to RGB (0-255) using integer math."""
+    # Work in units of 1/10000 so chroma stays integral
+    c = v * s
+    x = (c * (60 - abs(h % 120 - 60)) + 30) // 60
+    m = v * 100 - c
+    parts = (c + m, x + m, m)
+    ri, gi, bi = _HSV_SECTORS[h // 60 % 6]
+    return (
+        (parts[ri] * 255 + 5000) // 10000,
+        (parts[gi] * 255 + 5000) // 10000,
+        (parts[bi] * 255 + 5000) // 10000,
+    )
+
+
+def _rgb255_to_hsv360(r: int, g: int, b: int) -> tuple[int, int, int]:
+    """Convert RGB (0-255) to H(0-359), S(0-100), V(0-100) using integer math."""
+    high = max(r, g, b)
+    delta = high - min(r, g, b)
+    v = (high * 100 + 127) // 255
+    if not delta:
+        return 0, 0, v
+    s = (delta * 100 + high // 2) // high
+    if high == r:
+        h = (120 * (g - b) + delta) // (2 * delta)
+    elif high == g:
+        h = 120 + (120 * (b - r) + delta) // (2 * delta)
+    else:
+        h = 240 + (120 * (r - g) + delta) // (2 * delta)
+    return h % 360, s, v
+
 
 class HelloFairyAPI:
     """Hello Fairy BLE API implementation based on protocol from esphome fairy.yaml."""
@@ -49,8 +101,13 @@ class HelloFairyAPI:
         self._ble_device = ble_device
         self._client = None
         self._update_callback = update_callback
-        self._ack_received = True
-        self._notify_only = False
+        self._ack_event = asyncio.Event()
+        self._ack_event.set()  # No command in flight
+        self._cmd_lock = asyncio.Lock()
+        self._ack_cmd: int | None = None  # Command byte of the outstanding write
+        self._disconnected = False  # Connection dropped while awaiting an ACK
+        # Device dropped the connection and hasn't been reached since
+        self.connection_lost = False
 
         # Device state
         self.state: bool | None = None
@@ -59,12 +116,30 @@ class HelloFairyAPI:
         self.hsv: tuple[int, int, int] | None = None  # H(0-359), S(0-100), V(0-100)
         self.current_preset: int | None = None
         self.mode: int | None = None  # 1=color, 2=preset
-        self.available_effects = list(EFFECT_PRESETS.keys())
+        self.available_effects = EFFECT_NAMES
+
+        # Last (hsv, rgb) conversion, reused while the color is unchanged
+        self._color_cache: tuple | None = None
 
     @property
     def address(self):
         return self._ble_device.address
 
+    def set_ble_device(self, ble_device: BLEDevice) -> None:
+        """Update the BLE device handle used for the next connection.
+
+        An advertisement means the device is in range again, so a lost
+        connection is no longer reported; the next command reconnects.
+        """
+        self._ble_device = ble_device
+        self.connection_lost = False
+
+    def _hsv_to_color(self, hsv: tuple[int, int, int]) -> tuple[int, int, int]:
+        """Convert HSV to RGB for Home Assistant, reusing the last result."""
+        if self._color_cache is None or self._color_cache[0] != hsv:
+            self._color_cache = (hsv, _hsv360_to_rgb255(*hsv))
+        return self._color_cache[1]
+
     async def _ensure_connected(self) -> None:
         """Ensure we have a connected BLE client."""
         if self._client is None or not self._client.is_connected:
@@ -72,64 +147,92 @@ class HelloFairyAPI:
 
     async def _connect(self) -> None:
         """Connect to Hello Fairy device."""
-        if self._client and self._client.is_connected:
+        client, self._client = self._client, None
+        if client and client.is_connected:
             with contextlib.suppress(BleakError, TimeoutError):
-                await self._client.disconnect()
+                await client.disconnect()
 
         try:
             # Use bleak_retry_connector for robust connection handling
             self._client = await bleak_retry_connector.establish_connection(
-                BleakClient, self._ble_device, self._ble_device.address
+                BleakClient,
+                self._ble_device,
+                self._ble_device.address,
+                disconnected_callback=self._on_disconnect,
+                ble_device_callback=lambda: self._ble_device,
             )
 
-            # Start notifications for status updates
+            # Start notifications for status updates on the new client
             await self._client.start_notify(
                 NOTIFY_CHARACTERISTIC_UUID, self._handle_notification
             )
+            self.connection_lost = False
         except (BleakError, TimeoutError) as err:
             self._client = None
             raise ConnectionError(
                 f"Failed to connect to Hello Fairy device at {self._ble_device.address}: {err}"
             ) from err
 
-    def _calculate_checksum(self, data: list) -> int:
-        """Calculate simple sum checksum for Hello Fairy protocol."""
-        return sum(data) % 256
+    def _on_disconnect(self, client: BleakClient) -> None:
+        """Handle the device dropping the connection."""
+        if client is not self._client:
+            # Stale client or a disconnect we started ourselves
+            return
 
-    async def _send_command(self, command: list):
-        """Send command to Hello Fairy device."""
-        await self._ensure_connected()
+        _LOGGER.debug("Disconnected from Hello Fairy device at %s", self.address)
+        self._client = None
+        self._disconnected = True
+        # Wake up a command waiting for its ACK
+        if not self._ack_event.is_set():
+            self._ack_event.set()
 
-        # Calculate and append checksum
-        checksum = self._calculate_checksum(command)
-        command.append(checksum)
+        # Let the coordinator mark the device unavailable
+        self.connection_lost = True
+        self._update_callback()
 
-        _LOGGER.debug("Sending command: %s", [f"{b:02x}" for b in command])
+    async def _send_command(self, command: bytes | bytearray):
+        """Send a complete frame (checksum included) to Hello Fairy device."""
+        # Serialize connect+write+ACK so each ACK belongs to the outstanding write
+        async with self._cmd_lock:
+            await self._ensure_connected()
 
-        await self._client.write_gatt_char(
-            COMMAND_CHARACTERISTIC_UUID, bytes(command), False
-        )
-        self._ack_received = False
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Sending command: %s", command.hex())
 
-        # Wait for ACK response
-        timeout = 5.0  # 5 second timeout
-        elapsed = 0.0
-        while not self._ack_received and elapsed < timeout:
-            await asyncio.sleep(0.1)
-            elapsed += 0.1
+            self._ack_cmd = command[1]
+            self._disconnected = False
+            self._ack_event.clear()
+            await self._client.write_gatt_char(
+                COMMAND_CHARACTERISTIC_UUID, command, False
+            )
 
-        if not self._ack_received:
-            raise TimeoutError(f"No ACK received for command after {timeout} seconds")
+            # Wait for ACK response
+            timeout = 5.0  # 5 second timeout
+            try:
+                await asyncio.wait_for(self._ack_event.wait(), timeout=timeout)
+            except asyncio.TimeoutError as err:
+                raise TimeoutError(
+                    f"No ACK received for command after {timeout} seconds"
+                ) from err
+
+            if self._disconnected:
+                self._disconnected = False
+                raise ConnectionError(
+                    f"Hello Fairy device at {self.address} disconnected before ACK"
+                )
 
     async def _handle_notification(
         self, characteristic: BleakGATTCharacteristic, data: bytearray
     ):
         """Handle notifications from Hello Fairy device."""
-        _LOGGER.debug("Received notification: %s", [f"{b:02x}" for b in data])
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Received notification: %s", data.hex())
 
         if len(data) == 4:  # ACK2 or ACK3
             _LOGGER.debug("Received ACK for command %d", data[1])
-            self._ack_received = True
+            # Only accept ACKs for the command type currently in flight
+            if data[1] == self._ack_cmd:
+                self._ack_event.set()
             # Tell coordinator to update state after ACK
             self._update_callback()
             return
@@ -139,8 +242,16 @@ class HelloFairyAPI:
             return
 
         # Parse status notification
-        # byte 6 is power state
+        # byte 6 is power state, byte 7 is mode
         power_state = data[6] == 1
+        mode = data[7]
+
+        # Reject truncated color/preset frames before changing any state
+        if power_state and mode in _STATUS_PAYLOADS:
+            if len(data) < 8 + _STATUS_PAYLOADS[mode].size:
+                _LOGGER.debug("Short mode %d response: %d bytes", mode, len(data))
+                return
+
         self.state = power_state
 
         if not power_state:
@@ -149,29 +260,27 @@ class HelloFairyAPI:
             return
 
         # Parse mode and color/preset data
-        mode = data[7]
         self.mode = mode
 
         if mode == 1:  # HSV color mode
             # bytes 8-9: H (0-359)
             # bytes 10-11: S (0-1000, scale to 0-100)
             # bytes 12-13: V (100-1000, scale to 0-100)
-            h = (data[8] << 8) | data[9]
-            s = ((data[10] << 8) | data[11]) // 10
-            v = ((data[12] << 8) | data[13]) // 10
+            h, s, v = _HSV_STATUS.unpack_from(data, 8)
+            s //= 10
+            v //= 10
 
             self.hsv = (h, s, v)
             self.brightness = v
 
             # Convert HSV to RGB for Home Assistant
-            r, g, b = colorsys.hsv_to_rgb(h / 360, s / 100, v / 100)
-            self.color = (int(r * 255), int(g * 255), int(b * 255))
+            self.color = self._hsv_to_color(self.hsv)
 
             _LOGGER.debug("Color mode - HSV: (%d,%d,%d), RGB: %s", h, s, v, self.color)
 
         elif mode == 2:  # Preset mode
-            preset = data[8]
-            bright = ((data[9] << 8) | data[10]) // 10
+            preset, bright = _PRESET_STATUS.unpack_from(data, 8)
+            bright //= 10
 
             self.current_preset = preset
             self.brightness = bright
@@ -185,8 +294,7 @@ class HelloFairyAPI:
         if self.state == state:
             return
 
-        command = [CMD_PREFIX, CMD_POWER, 0x01, 0x01 if state else 0x00]
-        await self._send_command(command)
+        await self._send_command(POWER_ON_FRAME if state else POWER_OFF_FRAME)
 
         # Update state immediately after successful ACK
         self.state = state
@@ -206,27 +314,32 @@ class HelloFairyAPI:
             s: 0-100 percent
             v: 0-100 percent
         """
-        if not self.state:
-            await self.set_power(True)
-            await asyncio.sleep(0.1)  # Wait for power on
-
         # Ensure we're in the right ranges
         h = max(0, min(359, h))
         s = max(0, min(100, s))
         v = max(0, min(100, v))
 
-        command = [
+        # Skip the write if the device already shows this color
+        if self.state and self.mode == MODE_COLOR and self.hsv == (h, s, v):
+            return
+
+        if not self.state:
+            await self.set_power(True)
+
+        # H (2 bytes), S and V (2 bytes each, 0-1000), then checksum
+        command = bytearray(_COLOR_FRAME.size + 1)
+        _COLOR_FRAME.pack_into(
+            command,
+            0,
             CMD_PREFIX,
             CMD_COLOR_PRESET,
             0x07,
             MODE_COLOR,
-            h >> 8,
-            h & 0xFF,  # H (2 bytes)
-            (s * 10) >> 8,
-            (s * 10) & 0xFF,  # S (2 bytes, 0-1000)
-            (v * 10) >> 8,
-            (v * 10) & 0xFF,  # V (2 bytes, 0-1000)
-        ]
+            h,
+            s * 10,
+            v * 10,
+        )
+        command[-1] = _cksum(command)
 
         await self._send_command(command)
 
@@ -236,20 +349,15 @@ class HelloFairyAPI:
         self.mode = MODE_COLOR
         self.current_preset = None
         # Convert HSV to RGB for Home Assistant
-        r, g, b = colorsys.hsv_to_rgb(h / 360, s / 100, v / 100)
-        self.color = (int(r * 255), int(g * 255), int(b * 255))
+        self.color = self._hsv_to_color(self.hsv)
 
     async def set_color_rgb(self, r: int, g: int, b: int):
         """Set color using RGB values (0-255)."""
         # Convert RGB to HSV
-        h, s, v = colorsys.rgb_to_hsv(r / 255, g / 255, b / 255)
-        h_deg = int(h * 360)
-        s_pct = int(s * 100)
-        v_pct = (
-            int(v * 100) if v > 0 else (self.brightness or 50)
-        )  # Maintain brightness
+        h, s, v = _rgb255_to_hsv360(r, g, b)
+        v = v or self.brightness or 50  # Maintain brightness
 
-        await self.set_color_hsv(h_deg, s_pct, v_pct)
+        await self.set_color_hsv(h, s, v)
 
     async def set_brightness(self, brightness: int):
         """Set brightness (0-100)."""
@@ -266,24 +374,38 @@ class HelloFairyAPI:
             # If no color set, use white
             await self.set_color_hsv(0, 0, brightness)
 
-    async def set_preset(self, preset: int):
-        """Set preset effect (1-58)."""
+    async def set_preset(self, preset: int, brightness: int | None = None):
+        """Set preset effect (1-58), optionally with brightness (0-100)."""
+        preset = max(1, min(58, preset))
+        if brightness is None:
+            brightness = self.brightness or 50
+        brightness = max(0, min(100, brightness))
+
+        # Skip the write if the device already runs this preset
+        if (
+            self.state
+            and self.mode == MODE_PRESET
+            and self.current_preset == preset
+            and self.brightness == brightness
+        ):
+            return
+
         if not self.state:
             await self.set_power(True)
-            await asyncio.sleep(0.1)
 
-        preset = max(1, min(58, preset))
-        brightness = self.brightness or 50
-
-        command = [
+        # Preset (1 byte), brightness (2 bytes, 0-1000), then checksum
+        command = bytearray(_PRESET_FRAME.size + 1)
+        _PRESET_FRAME.pack_into(
+            command,
+            0,
             CMD_PREFIX,
             CMD_COLOR_PRESET,
             0x04,
             MODE_PRESET,
             preset,
-            (brightness * 10) >> 8,
-            (brightness * 10) & 0xFF,
-        ]
+            brightness * 10,
+        )
+        command[-1] = _cksum(command)
 
         await self._send_command(command)
 
@@ -303,23 +425,62 @@ class HelloFairyAPI:
         else:
             _LOGGER.warning("Unknown effect: %s", effect_name)
 
-    async def request_status(self):
-        """Request current status from device."""
-        # Hello Fairy protocol doesn't seem to have explicit status request
-        # Status is received via notifications
-        pass
+    async def apply_state(
+        self,
+        power: bool,
+        rgb: tuple[int, int, int] | None = None,
+        brightness_pct: int | None = None,
+        effect: str | None = None,
+    ):
+        """Apply a complete light state with as few BLE writes as possible.
+
+        Color, brightness and effect are folded into a single color or preset
+        frame, preceded by a power-on frame only when the device is not on.
+        Nothing is sent if the device already reports the requested state.
+
+        Args:
+            power: Requested power state
+            rgb: Requested color, RGB (0-255)
+            brightness_pct: Requested brightness, 0-100 percent
+            effect: Requested effect name
+        """
+        if not power:
+            await self.set_power(False)
+            return
+
+        if effect is not None and effect not in EFFECT_PRESETS:
+            _LOGGER.warning("Unknown effect: %s", effect)
+            effect = None
+
+        if effect is not None or (
+            rgb is None and brightness_pct is not None and self.mode == MODE_PRESET
+        ):
+            # Preset frame carries its own brightness
+            preset = EFFECT_PRESETS[effect] if effect else self.current_preset
+            await self.set_preset(preset, brightness_pct)
+            return
+
+        if rgb is None and brightness_pct is None:
+            await self.set_power(True)
+            return
+
+        if rgb is not None:
+            h, s, v = _rgb255_to_hsv360(*rgb)
+            if brightness_pct is None:
+                # Same rule as set_color_rgb: the color's own V, unless black
+                brightness_pct = v or self.brightness or 50
+        else:
+            # If no color set, use white
+            h, s = self.hsv[:2] if self.hsv else (0, 0)
 
-    def get_available_effects(self) -> list:
-        """Get list of available effects."""
-        return list(EFFECT_PRESETS.keys())
+        await self.set_color_hsv(h, s, brightness_pct)
 
     async def disconnect(self) -> None:
         """Disconnect from the device."""
-        if self._client and self._client.is_connected:
+        client, self._client = self._client, None
+        if client and client.is_connected:
+            # Disconnecting drops the notification subscription as well
             try:
-                await self._client.stop_notify(NOTIFY_CHARACTERISTIC_UUID)
-                await self._client.disconnect()
+                await client.disconnect()
             except Exception:  # Ignore in cleanup
                 pass
-            finally:
-                self._client = None
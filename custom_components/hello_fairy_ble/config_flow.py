@@ -49,7 +49,9 @@ class HelloFairyConfigFlow(ConfigFlow, domain=DOMAIN):
             address = discovery_info.address
             if address in current_addresses or address in self._discovered_devices:
                 continue
-            if not any(discovery_info.name.startswith(name) for name in DISCOVERY_NAMES):
+            # Match on name; adverts don't carry SERVICE_UUID (see fairy.yaml)
+            name = discovery_info.name
+            if not name or not name.startswith(DISCOVERY_NAMES):
                 continue
             self._discovered_devices[address] = discovery_info
 
@@ -13,8 +13,16 @@ CMD_COLOR_PRESET = 0x03
 MODE_COLOR = 0x01
 MODE_PRESET = 0x02
 
-ACK2 = [0xAA, 0x02, 0x00, 0xAC]
-ACK3 = [0xAA, 0x03, 0x00, 0xAD]
+# Precomputed power frames (payload + checksum)
+POWER_ON_FRAME = bytes(
+    [CMD_PREFIX, CMD_POWER, 0x01, 0x01, (CMD_PREFIX + CMD_POWER + 0x01 + 0x01) & 0xFF]
+)
+POWER_OFF_FRAME = bytes(
+    [CMD_PREFIX, CMD_POWER, 0x01, 0x00, (CMD_PREFIX + CMD_POWER + 0x01 + 0x00) & 0xFF]
+)
+
+ACK2 = bytes([0xAA, 0x02, 0x00, 0xAC])
+ACK3 = bytes([0xAA, 0x03, 0x00, 0xAD])
 
 # Preset effects mapping
 EFFECT_PRESETS = {
@@ -33,3 +41,7 @@ EFFECT_PRESETS = {
     "May Day": 48,
     "Snow Day": 54,
 }
+
+# Effect names in display order and reverse lookup from preset number
+EFFECT_NAMES = tuple(EFFECT_PRESETS)
+EFFECT_BY_PRESET = {preset: name for name, preset in EFFECT_PRESETS.items()}
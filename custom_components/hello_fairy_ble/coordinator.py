@@ -1,22 +1,47 @@
 """Hello Fairy BLE coordinator for data updates."""
 
+import asyncio
+import contextlib
 import logging
+from collections import deque
 from dataclasses import dataclass
-from datetime import timedelta
 
-from homeassistant.components import bluetooth
+from bleak.backends.device import BLEDevice
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS, CONF_NAME
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import HelloFairyAPI
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+# Quiet period before a spinner-driven preset is sent, about one BLE roundtrip
+DEBOUNCE_COOLDOWN = 0.15
 
-@dataclass
+
+def _coalesce_key(method: str, args: tuple) -> tuple | None:
+    """Return what a queued command sets, or None if it must not be replaced.
+
+    A waiting command can be replaced by a newer one with the same key, so
+    only the latest value of e.g. a slider drag is sent.
+    """
+    if method == "apply_state":
+        power, rgb, brightness_pct, effect = args
+        return (
+            method,
+            power,
+            rgb is not None,
+            brightness_pct is not None,
+            effect is not None,
+        )
+    if method in ("set_power", "set_preset"):
+        return (method,)
+    return None
+
+
+@dataclass(frozen=True, slots=True)
 class HelloFairyApiData:
     """Class to hold Hello Fairy API data."""
 
@@ -26,86 +51,187 @@ class HelloFairyApiData:
     hsv: tuple[int, int, int] | None = None  # H(0-359), S(0-100), V(0-100)
     current_preset: int | None = None
     mode: int | None = None  # 1=color, 2=preset
-    available_effects: list[str] | None = None
+    available_effects: tuple[str, ...] | None = None
 
 
 class HelloFairyCoordinator(DataUpdateCoordinator[HelloFairyApiData]):
     """Hello Fairy coordinator."""
 
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    def __init__(
+        self, hass: HomeAssistant, config_entry: ConfigEntry, ble_device: BLEDevice
+    ) -> None:
         """Initialize coordinator."""
 
         # Set variables from values entered in config flow setup
         self.device_name = config_entry.data[CONF_NAME]
         self.device_address = config_entry.data[CONF_ADDRESS]
 
-        # Get connection to bluetooth device
-        ble_device = bluetooth.async_ble_device_from_address(
-            hass, self.device_address, connectable=False
-        )
-        assert ble_device
         self._api = HelloFairyAPI(ble_device, self._async_push_data)
 
+        # Effect list never changes; state tuple of the last published data
+        self._static_effects = self._api.available_effects
+        self._last_snapshot: tuple | None = None
+
         # Initialize DataUpdateCoordinator
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN} ({config_entry.unique_id})",
-            # Hello Fairy pushes data via notifications, so use longer interval
-            update_interval=timedelta(seconds=600),
+            # Hello Fairy pushes data via notifications, so never poll
+            update_interval=None,
             config_entry=config_entry,
+            # Don't notify entities when a refresh returns unchanged data
+            always_update=False,
+        )
+
+        # FIFO of [api method name, args, waiting futures, earliest send time],
+        # run one at a time
+        self._cmd_queue: deque[list] = deque()
+        self._cmd_wakeup = asyncio.Event()
+        self._worker = hass.async_create_background_task(
+            self._process_queue(), f"{DOMAIN} command queue ({self.device_address})"
+        )
+
+    def _snapshot(self) -> tuple:
+        """Return the current device state in HelloFairyApiData field order."""
+        api = self._api
+        return (
+            api.state,
+            api.brightness,
+            api.color,
+            api.hsv,
+            api.current_preset,
+            api.mode,
         )
 
     @callback
     def _async_push_data(self) -> None:
         """Handle pushed data from device notifications."""
         # This callback is triggered when the device pushes new data
-        # It should trigger a coordinator refresh
-        self.async_set_updated_data(
-            HelloFairyApiData(
-                state=self._api.state,
-                brightness=self._api.brightness,
-                color=self._api.color,
-                hsv=self._api.hsv,
-                current_preset=self._api.current_preset,
-                mode=self._api.mode,
-                available_effects=self._api.available_effects,
+        if self._api.connection_lost:
+            # Entities report unavailable until the device is reachable again
+            self.async_set_update_error(
+                ConnectionError(f"Lost connection to {self.device_address}")
             )
-        )
+            return
 
-    async def _async_update_data(self) -> HelloFairyApiData:
-        """Fetch data from API endpoint."""
-        # This method handles periodic updates when push notifications aren't received
-        return HelloFairyApiData(
-            state=self._api.state,
-            brightness=self._api.brightness,
-            color=self._api.color,
-            hsv=self._api.hsv,
-            current_preset=self._api.current_preset,
-            mode=self._api.mode,
-            available_effects=self._api.available_effects,
-        )
+        # Only fan out to entities when the state or availability changed
+        snap = self._snapshot()
+        if snap == self._last_snapshot and self.last_update_success:
+            return
+        self._last_snapshot = snap
+        self.async_set_updated_data(HelloFairyApiData(*snap, self._static_effects))
 
-    async def set_power(self, state: bool):
-        """Set power state."""
-        await self._api.set_power(state)
+    async def _async_update_data(self) -> HelloFairyApiData:
+        """Return the cached device state.
+
+        Only runs for the first refresh and explicit refresh requests; there
+        is no polling since all state arrives via notifications.
+        """
+        if self._api.connection_lost:
+            raise UpdateFailed(f"Lost connection to {self.device_address}")
+        snap = self._snapshot()
+        if snap == self._last_snapshot and self.data is not None:
+            return self.data
+        self._last_snapshot = snap
+        return HelloFairyApiData(*snap, self._static_effects)
 
-    async def set_brightness(self, brightness: int):
-        """Set brightness (0-100)."""
-        await self._api.set_brightness(brightness)
+    @callback
+    def set_ble_device(self, ble_device: BLEDevice) -> None:
+        """Use a newer BLE device handle from a bluetooth advertisement."""
+        was_lost = self._api.connection_lost
+        self._api.set_ble_device(ble_device)
+        if was_lost:
+            # Device is in range again; make the entities available
+            self._async_push_data()
+
+    async def async_shutdown(self) -> None:
+        """Stop the command queue worker and disconnect from the device."""
+        await super().async_shutdown()
+        self._worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._worker
+        while self._cmd_queue:
+            for future in self._cmd_queue.popleft()[2]:
+                future.cancel()
+        await self._api.disconnect()
+
+    async def _process_queue(self) -> None:
+        """Send queued commands to the device in submission order."""
+        while True:
+            while not self._cmd_queue:
+                self._cmd_wakeup.clear()
+                await self._cmd_wakeup.wait()
+
+            # A debounced command keeps its place until its quiet period ends
+            delay = self._cmd_queue[0][3] - self.hass.loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            method, args, futures, _ = self._cmd_queue.popleft()
+            try:
+                await getattr(self._api, method)(*args)
+            except asyncio.CancelledError:
+                # Worker is stopping; don't leave callers of this command waiting
+                for future in futures:
+                    future.cancel()
+                raise
+            except Exception as err:  # Reported to the callers, keep the worker alive
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(err)
+            else:
+                for future in futures:
+                    if not future.done():
+                        future.set_result(None)
+                # Publish the state confirmed by the ACK
+                self._async_push_data()
 
-    async def set_color_rgb(self, r: int, g: int, b: int):
-        """Set color using RGB values."""
-        await self._api.set_color_rgb(r, g, b)
+    @callback
+    def _enqueue(
+        self, method: str, args: tuple, futures: list, delay: float = 0.0
+    ) -> None:
+        """Queue an API command; futures are resolved once it has been sent.
+
+        The command is not sent before `delay` seconds have passed.
+        """
+        send_at = self.hass.loop.time() + delay
+        tail = self._cmd_queue[-1] if self._cmd_queue else None
+        key = _coalesce_key(method, args)
+        if (
+            tail is not None
+            and key is not None
+            and key == _coalesce_key(tail[0], tail[1])
+        ):
+            # Replace a not yet sent value of the same command
+            tail[1] = args
+            tail[2].extend(futures)
+            tail[3] = max(tail[3], send_at)
+        else:
+            self._cmd_queue.append([method, args, futures, send_at])
+            self._cmd_wakeup.set()
+
+    async def _submit(self, method: str, *args, delay: float = 0.0) -> None:
+        """Queue an API command and wait until it has been sent."""
+        future = self.hass.loop.create_future()
+        self._enqueue(method, args, [future], delay)
+        await future
+
+    async def apply_state(
+        self,
+        power: bool,
+        rgb: tuple[int, int, int] | None = None,
+        brightness_pct: int | None = None,
+        effect: str | None = None,
+    ):
+        """Apply power, color, brightness and effect in one step."""
+        await self._submit("apply_state", power, rgb, brightness_pct, effect)
 
-    async def set_color_hsv(self, h: int, s: int, v: int):
-        """Set color using HSV values."""
-        await self._api.set_color_hsv(h, s, v)
+    async def set_power(self, state: bool):
+        """Set power state."""
+        await self._submit("set_power", state)
 
     async def set_preset(self, preset: int):
-        """Set preset effect."""
-        await self._api.set_preset(preset)
-
-    async def set_effect(self, effect_name: str):
-        """Set effect by name."""
-        await self._api.set_effect(effect_name)
+        """Set preset effect, sending only the last value of a quick series."""
+        await self._submit("set_preset", preset, delay=DEBOUNCE_COOLDOWN)
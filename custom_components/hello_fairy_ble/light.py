@@ -18,19 +18,15 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, EFFECT_PRESETS
+from .const import DOMAIN, EFFECT_BY_PRESET
 from .coordinator import HelloFairyCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def brightness_scale(
-    brightness_pct: int, from_min: int, from_max: int, to_min: int, to_max: int
-) -> int:
-    """Scale brightness between different ranges."""
-    return int(
-        to_min + (brightness_pct - from_min) * (to_max - to_min) / (from_max - from_min)
-    )
+# Brightness lookup tables between HA (0-255) and Hello Fairy (0-100) ranges
+_HA_TO_FAIRY = tuple(round(i * 100 / 255) for i in range(256))
+_FAIRY_TO_HA = tuple(round(i * 255 / 100) for i in range(101))
 
 
 async def async_setup_entry(
@@ -44,7 +40,7 @@ async def async_setup_entry(
         config_entry.entry_id
     ].coordinator
 
-    async_add_entities([HelloFairyLight(coordinator)], True)
+    async_add_entities([HelloFairyLight(coordinator)])
 
 
 class HelloFairyLight(CoordinatorEntity[HelloFairyCoordinator], LightEntity):
@@ -75,7 +71,7 @@ class HelloFairyLight(CoordinatorEntity[HelloFairyCoordinator], LightEntity):
         """Return the current brightness (0-255)."""
         if self.coordinator.data.brightness is not None:
             # Convert from Hello Fairy range (0-100) to HA range (0-255)
-            return brightness_scale(self.coordinator.data.brightness, 0, 100, 0, 255)
+            return _FAIRY_TO_HA[min(self.coordinator.data.brightness, 100)]
         return None
 
     @property
@@ -89,42 +85,37 @@ class HelloFairyLight(CoordinatorEntity[HelloFairyCoordinator], LightEntity):
         return self.coordinator.data.color
 
     @property
-    def effect_list(self) -> list[str] | None:
+    def effect_list(self) -> tuple[str, ...] | None:
         """Return list of available effects."""
         return self.coordinator.data.available_effects
 
     @property
     def effect(self) -> str | None:
         """Return current effect."""
-        if self.coordinator.data.mode == 2 and self.coordinator.data.current_preset:
+        if self.coordinator.data.mode == 2:
             # Find effect name by preset number
-            preset_num = self.coordinator.data.current_preset
-            for effect_name, preset_value in EFFECT_PRESETS.items():
-                if preset_value == preset_num:
-                    return effect_name
+            return EFFECT_BY_PRESET.get(self.coordinator.data.current_preset)
         return None
 
     async def async_turn_on(self, **kwargs):
         """Turn device on."""
-        # Always turn on first
-        await self.coordinator.set_power(True)
+        state: dict = {}
 
         # Handle brightness
         if ATTR_BRIGHTNESS in kwargs:
-            brightness_255 = kwargs.get(ATTR_BRIGHTNESS, 255)
             # Convert from HA range (0-255) to Hello Fairy range (0-100)
-            brightness_100 = brightness_scale(brightness_255, 0, 255, 0, 100)
-            await self.coordinator.set_brightness(brightness_100)
+            state["brightness_pct"] = _HA_TO_FAIRY[kwargs[ATTR_BRIGHTNESS]]
 
         # Handle color
         if ATTR_RGB_COLOR in kwargs:
-            red, green, blue = kwargs.get(ATTR_RGB_COLOR)
-            await self.coordinator.set_color_rgb(red, green, blue)
+            state["rgb"] = tuple(kwargs[ATTR_RGB_COLOR])
 
         # Handle effect
         if ATTR_EFFECT in kwargs:
-            effect_name = kwargs.get(ATTR_EFFECT)
-            await self.coordinator.set_effect(effect_name)
+            state["effect"] = kwargs[ATTR_EFFECT]
+
+        # Send everything as a single command
+        await self.coordinator.apply_state(True, **state)
 
         # Update state
         await self.coordinator.async_request_refresh()
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
 
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
@@ -66,11 +65,6 @@ class HelloFairyPresetNumber(CoordinatorEntity[HelloFairyCoordinator], NumberEnt
         """Return if entity is available."""
         return super().available and self.coordinator.data is not None
 
-    @property
-    def entity_registry_enabled_default(self) -> bool:
-        """Return if entity should be enabled when first added."""
-        return True
-
     async def async_set_native_value(self, value: float) -> None:
         """Set the preset number."""
         preset_num = int(value)